@@ -1,13 +1,15 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useState, lazy, Suspense } from "react";
 import { QueryClient, QueryClientProvider } from "@tanstack/react-query";
 import { BrowserRouter, Routes, Route } from "react-router-dom";
 import { ThemeProvider } from "next-themes";
 import { Toaster as AppToaster } from "@/components/ui/toaster";
 import { Toaster as AppSonner } from "@/components/ui/sonner";
 import Index from "./pages/Index";
-import Settings from "./pages/Settings";
-import CRM from "./pages/CRM";
-import NotFound from "./pages/NotFound";
+
+// Chat is the default surface; the secondary pages load on navigation
+const Settings = lazy(() => import("./pages/Settings"));
+const CRM = lazy(() => import("./pages/CRM"));
+const NotFound = lazy(() => import("./pages/NotFound"));
 
 const ClientToasters = () => {
   const [mounted, setMounted] = useState(false);
@@ -29,12 +31,20 @@ const App = () => {
       <BrowserRouter>
         <ThemeProvider attribute="class" defaultTheme="dark" enableSystem>
           <ClientToasters />
-          <Routes>
-            <Route path="/" element={<Index />} />
-            <Route path="/settings" element={<Settings />} />
-            <Route path="/crm" element={<CRM />} />
-            <Route path="*" element={<NotFound />} />
-          </Routes>
+          <Suspense
+            fallback={
+              <div className="min-h-screen flex items-center justify-center bg-background">
+                <div className="animate-pulse text-muted-foreground">Loading...</div>
+              </div>
+            }
+          >
+            <Routes>
+              <Route path="/" element={<Index />} />
+              <Route path="/settings" element={<Settings />} />
+              <Route path="/crm" element={<CRM />} />
+              <Route path="*" element={<NotFound />} />
+            </Routes>
+          </Suspense>
         </ThemeProvider>
       </BrowserRouter>
     </QueryClientProvider>
@@ -10,6 +10,7 @@ import {
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { FolderSync, Folder, ChevronRight, Loader2, Unlink, FileText } from "lucide-react";
 import { supabase } from "@/integrations/supabase/client";
+import { createNotes, updateNote } from "@/lib/supabase-api";
 import { toast } from "sonner";
 
 interface GoogleDriveNotesSyncProps {
@@ -262,7 +263,23 @@ const GoogleDriveNotesSync: React.FC<GoogleDriveNotesSyncProps> = ({ onSyncCompl
       }
 
       const files = filesData?.data || [];
-      let synced = 0;
+
+      // One lookup for previously synced notes (they all start with a "# "
+      // title line) instead of one existence query per file
+      const { data: syncedNotes } = await supabase
+        .from("notes")
+        .select("id, content")
+        .eq("user_id", user.id)
+        .like("content", "# %");
+
+      // Keyed case-insensitively, matching the ilike lookup this replaces
+      const noteIdByTitle = new Map<string, string>();
+      for (const note of syncedNotes || []) {
+        noteIdByTitle.set(note.content.split("\n", 1)[0].toLowerCase(), note.id);
+      }
+
+      const newNoteContents: string[] = [];
+      let updated = 0;
 
       for (const file of files) {
         // Only sync Google Docs and text files
@@ -281,32 +298,22 @@ const GoogleDriveNotesSync: React.FC<GoogleDriveNotesSyncProps> = ({ onSyncCompl
         }
 
         const content = `# ${file.name}\n\n${downloadData?.data?.content || ""}`;
+        const existingId = noteIdByTitle.get(`# ${file.name}`.toLowerCase());
 
-        // Check if note already exists (by searching for title in first line)
-        const { data: existingNotes } = await supabase
-          .from("notes")
-          .select("id, content")
-          .eq("user_id", user.id)
-          .ilike("content", `# ${file.name}%`);
-
-        if (existingNotes && existingNotes.length > 0) {
-          // Update existing note
-          await supabase
-            .from("notes")
-            .update({ content, updated_at: new Date().toISOString() })
-            .eq("id", existingNotes[0].id);
+        if (existingId) {
+          // Update through the API helper so the search cache is invalidated,
+          // matching how new notes go through createNotes
+          await updateNote(existingId, content);
+          updated++;
         } else {
-          // Create new note
-          await supabase.from("notes").insert({
-            user_id: user.id,
-            content,
-            visibility: "personal",
-          });
+          // Collect new notes and insert them as one batch below
+          newNoteContents.push(content);
         }
-
-        synced++;
       }
 
+      await createNotes(newNoteContents);
+
+      const synced = updated + newNoteContents.length;
       toast.success(`Synced ${synced} notes from Google Drive`);
       onSyncComplete?.();
     } catch (error: any) {
@@ -7,6 +7,9 @@ import { toast } from "sonner";
 import { supabase } from "@/integrations/supabase/client";
 import { cn } from "@/lib/utils";
 
+// Google Docs exported as text keep a .txt suffix we strip from titles
+const TXT_EXT_RE = /\.txt$/;
+
 interface DriveFolder {
   id: string;
   name: string;
@@ -152,9 +155,13 @@ export const GoogleDriveSync: React.FC<GoogleDriveSyncProps> = ({
         return;
       }
 
-      // Get files from Drive
+      // Get files from Drive - only Google Docs are synced, so filter remotely
       const { data: driveData, error: driveError } = await supabase.functions.invoke("google-drive", {
-        body: { action: "list-files", folderId: driveFolderId },
+        body: {
+          action: "list-files",
+          folderId: driveFolderId,
+          mimeType: "application/vnd.google-apps.document",
+        },
       });
 
       if (driveError || driveData.error) {
@@ -176,60 +183,83 @@ export const GoogleDriveSync: React.FC<GoogleDriveSyncProps> = ({
           .map((d: any) => [d.drive_file_id, d])
       );
 
-      let imported = 0;
-      let updated = 0;
-
-      // Import/update files from Drive
-      for (const file of driveFiles) {
-        // Skip folders
-        if (file.mimeType === "application/vnd.google-apps.folder") continue;
-
-        // Only handle Google Docs (text documents) for now
-        if (file.mimeType === "application/vnd.google-apps.document") {
-          const existing = existingByDriveId.get(file.id);
-
-          // Download content
-          const { data: downloadData } = await supabase.functions.invoke("google-drive", {
-            body: { action: "download", fileId: file.id, mimeType: file.mimeType },
-          });
-
-          if (!downloadData?.data?.content) continue;
-
-          if (existing) {
-            // Update existing document
-            await supabase
-              .from("project_documents")
-              .update({
-                content: downloadData.data.content,
-                updated_at: new Date().toISOString(),
-              })
-              .eq("id", existing.id);
-            updated++;
-          } else {
-            // Create new document
-            const { data: { user } } = await supabase.auth.getUser();
-            if (user) {
-              await supabase.from("project_documents").insert({
-                project_id: projectId,
-                user_id: user.id,
-                name: file.name.replace(/\.txt$/, ""),
-                type: "document",
-                content: downloadData.data.content,
-                drive_file_id: file.id,
-              });
-              imported++;
-            }
-          }
+      // One auth lookup for the whole sync instead of one per imported file
+      const { data: { user } } = await supabase.auth.getUser();
+
+      const syncFile = async (file: any): Promise<"imported" | "updated" | "failed" | null> => {
+        const existing = existingByDriveId.get(file.id);
+
+        // The listing already carries modifiedTime - skip documents unchanged
+        // since the last completed sync instead of re-downloading. The sync
+        // timestamp is the baseline here, not the document's updated_at:
+        // in-app edits bump updated_at, and Drive content must still win on
+        // the next sync.
+        if (
+          existing &&
+          file.modifiedTime &&
+          driveLastSyncedAt &&
+          new Date(file.modifiedTime).getTime() <= new Date(driveLastSyncedAt).getTime()
+        ) {
+          return null;
         }
+
+        // Download content
+        const { data: downloadData, error: downloadError } = await supabase.functions.invoke("google-drive", {
+          body: { action: "download", fileId: file.id, mimeType: file.mimeType },
+        });
+
+        if (downloadError || !downloadData?.data?.content) {
+          console.error(`Failed to download ${file.name}:`, downloadError);
+          return "failed";
+        }
+
+        if (existing) {
+          // Update existing document
+          await supabase
+            .from("project_documents")
+            .update({ content: downloadData.data.content })
+            .eq("id", existing.id);
+          return "updated";
+        }
+
+        // Create new document
+        if (!user) return null;
+        await supabase.from("project_documents").insert({
+          project_id: projectId,
+          user_id: user.id,
+          name: file.name.replace(TXT_EXT_RE, ""),
+          type: "document",
+          content: downloadData.data.content,
+          drive_file_id: file.id,
+        });
+        return "imported";
+      };
+
+      // Import/update files from Drive a few at a time - concurrency hides
+      // download latency, but an unbounded fan-out over a large folder trips
+      // Drive's per-user rate limits
+      const BATCH_SIZE = 5;
+      const outcomes: ("imported" | "updated" | "failed" | null)[] = [];
+      for (let i = 0; i < driveFiles.length; i += BATCH_SIZE) {
+        const batch = driveFiles.slice(i, i + BATCH_SIZE);
+        outcomes.push(...(await Promise.all(batch.map(syncFile))));
       }
 
+      const imported = outcomes.filter((o) => o === "imported").length;
+      const updated = outcomes.filter((o) => o === "updated").length;
+      const failed = outcomes.filter((o) => o === "failed").length;
+
       // Update last synced timestamp
       await supabase
         .from("projects")
         .update({ drive_last_synced_at: new Date().toISOString() })
         .eq("id", projectId);
 
-      toast.success(`Sync complete: ${imported} imported, ${updated} updated`);
+      if (failed > 0) {
+        toast.error(`Sync finished with ${failed} failed download${failed === 1 ? "" : "s"}: ${imported} imported, ${updated} updated`);
+      } else {
+        toast.success(`Sync complete: ${imported} imported, ${updated} updated`);
+      }
       onSyncComplete();
     } catch (error) {
       console.error("Sync error:", error);
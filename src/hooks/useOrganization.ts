@@ -39,6 +39,22 @@ export interface OrganizationContext {
 
 const CONTEXT_KEY = "sb_org_context";
 
+// Organizations change rarely but several components mount this hook; share
+// one fetched list across mounts instead of re-querying for each.
+// The list is RLS-filtered per account, so drop it whenever the signed-in
+// user changes - sign-out/sign-in happens in-SPA without a reload.
+const ORGS_CACHE_TTL_MS = 60_000;
+let orgsCache: { at: number; data: Organization[] } | null = null;
+
+let cachedUserId: string | null = null;
+supabase.auth.onAuthStateChange((_event, session) => {
+  const userId = session?.user?.id ?? null;
+  if (userId !== cachedUserId) {
+    cachedUserId = userId;
+    orgsCache = null;
+  }
+});
+
 export function useOrganization() {
   const { user } = useAuth();
   const [organizations, setOrganizations] = useState<Organization[]>([]);
@@ -59,15 +75,25 @@ export function useOrganization() {
 
   const fetchOrganizations = useCallback(async () => {
     if (!user) return;
-    
-    const { data, error } = await supabase
-      .from("organizations")
-      .select("*")
-      .order("name");
 
-    if (!error && data) {
+    let data = orgsCache && Date.now() - orgsCache.at < ORGS_CACHE_TTL_MS
+      ? orgsCache.data
+      : null;
+
+    if (!data) {
+      const { data: fetched, error } = await supabase
+        .from("organizations")
+        .select("*")
+        .order("name");
+      if (!error && fetched) {
+        orgsCache = { at: Date.now(), data: fetched };
+        data = fetched;
+      }
+    }
+
+    if (data) {
       setOrganizations(data);
-      
+
       // If context has an org, set it as current
       if (context.organizationId) {
         const org = data.find(o => o.id === context.organizationId);
@@ -137,8 +163,9 @@ export function useOrganization() {
     }
 
     // Update the organizations list
+    orgsCache = null;
     setOrganizations(prev => [...prev, newOrg]);
-    
+
     return newOrg;
   };
 
@@ -1181,6 +1181,31 @@ export type Database = {
           similarity: number
         }[]
       }
+      search_memory: {
+        Args: { p_limit?: number; p_query: string; p_type?: string }
+        Returns: {
+          content: string
+          id: string
+          result_type: string
+          score: number
+        }[]
+      }
+      search_messages_ranked: {
+        Args: { p_limit?: number; p_query: string }
+        Returns: {
+          content: string
+          conversation_id: string
+          score: number
+        }[]
+      }
+      search_notes_ranked: {
+        Args: { p_limit?: number; p_query: string }
+        Returns: {
+          content: string
+          id: string
+          score: number
+        }[]
+      }
     }
     Enums: {
       company_type: "lead" | "client"
@@ -141,12 +141,18 @@ export interface CalendarEvent {
 }
 
 // ============ NOTES ============
-export async function fetchNotes(): Promise<Note[]> {
+// Column list shared by the notes read paths, defined once
+const NOTE_COLUMNS = "id, content, formatted_content, category_id, created_at, updated_at";
+
+export async function fetchNotes(limit = 500): Promise<Note[]> {
+  // Newest-first with a generous cap - the panel renders recent notes, and an
+  // unbounded select grows with account age
   const { data, error } = await supabase
     .from("notes")
-    .select("id, content, formatted_content, category_id, created_at, updated_at")
-    .order("updated_at", { ascending: false });
-  
+    .select(NOTE_COLUMNS)
+    .order("updated_at", { ascending: false })
+    .limit(limit);
+
   if (error) {
     console.error("Error fetching notes:", error);
     return [];
@@ -155,7 +161,8 @@ export async function fetchNotes(): Promise<Note[]> {
 }
 
 export async function createNote(content: string): Promise<Note | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -168,13 +175,37 @@ export async function createNote(content: string): Promise<Note | null> {
     console.error("Error creating note:", error);
     return null;
   }
+  searchCache.clear();
   return data;
 }
 
+export async function createNotes(
+  contents: string[],
+  visibility: "personal" | "organization" = "personal"
+): Promise<Note[]> {
+  if (contents.length === 0) return [];
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
+  if (!user) return [];
+
+  // One insert for the whole batch instead of one round-trip per note
+  const { data, error } = await supabase
+    .from("notes")
+    .insert(contents.map(content => ({ content, user_id: user.id, visibility })))
+    .select(NOTE_COLUMNS);
+
+  if (error) {
+    console.error("Error creating notes:", error);
+    return [];
+  }
+  searchCache.clear();
+  return data || [];
+}
+
 export async function updateNote(id: string, content: string): Promise<Note | null> {
   const { data, error } = await supabase
     .from("notes")
-    .update({ content, updated_at: new Date().toISOString() })
+    .update({ content })
     .eq("id", id)
     .select()
     .single();
@@ -183,6 +214,7 @@ export async function updateNote(id: string, content: string): Promise<Note | nu
     console.error("Error updating note:", error);
     return null;
   }
+  searchCache.clear();
   return data;
 }
 
@@ -192,76 +224,113 @@ export async function deleteNote(id: string): Promise<boolean> {
     console.error("Error deleting note:", error);
     return false;
   }
+  searchCache.clear();
   return true;
 }
 
-export async function searchNotes(query: string): Promise<Note[]> {
-  const { data, error } = await supabase
-    .from("notes")
-    .select("id, content, formatted_content, category_id, created_at, updated_at")
-    .ilike("content", `%${query}%`)
-    .order("updated_at", { ascending: false })
-    .limit(20);
+// ============ SEARCH (combined) ============
+// Re-running the same search is common (retyping, switching tabs); keep a
+// small TTL'd cache. Note and message writes clear it.
+const SEARCH_CACHE_TTL_MS = 60_000;
+const searchCache = new Map<string, { at: number; data: SearchResult[] }>();
+
+export async function searchMemory(
+  query: string,
+  limit = 20,
+  type?: "note" | "conversation"
+): Promise<SearchResult[]> {
+  // Canonicalize before caching so retyped variants ("Foo ", "foo") share an
+  // entry - the backing matches are case-insensitive anyway
+  const normalized = query.trim();
+  if (!normalized) return [];
+
+  const cacheKey = `${type ?? "all"}:${limit}:${normalized.toLowerCase()}`;
+  const cached = searchCache.get(cacheKey);
+  if (cached && Date.now() - cached.at < SEARCH_CACHE_TTL_MS) {
+    return cached.data;
+  }
+
+  // One round-trip: notes and conversations are searched, ranked and merged
+  // into a single top-K server-side
+  const { data: hits, error } = await supabase.rpc("search_memory", {
+    p_query: normalized,
+    p_limit: limit,
+    p_type: type,
+  });
 
   if (error) {
-    console.error("Error searching notes:", error);
+    console.error("Error searching memory:", error);
+    // Don't cache a transient failure as an empty result
     return [];
   }
-  return data || [];
-}
 
-// ============ SEARCH (combined) ============
-export async function searchMemory(query: string): Promise<SearchResult[]> {
-  const results: SearchResult[] = [];
-
-  // Search notes
-  const notes = await searchNotes(query);
-  for (const note of notes) {
-    results.push({
-      id: note.id,
-      content: note.content.slice(0, 200),
-      score: 0.8, // Placeholder score for text search
-      type: "note",
-    });
-  }
+  // Rows arrive deduped, pre-trimmed to preview length and in final order
+  const results: SearchResult[] = (hits || []).map((hit) => ({
+    id: hit.id,
+    content: hit.content,
+    score: hit.score,
+    type: hit.result_type as "note" | "conversation",
+  }));
 
-  // Search messages in conversations
-  const { data: messages } = await supabase
-    .from("messages")
-    .select("id, conversation_id, content")
-    .ilike("content", `%${query}%`)
-    .limit(10);
-
-  if (messages) {
-    for (const msg of messages) {
-      results.push({
-        id: msg.conversation_id,
-        content: msg.content.slice(0, 200),
-        score: 0.7,
-        type: "conversation",
-      });
-    }
+  // Keep the cache bounded; drop the oldest query past 32 entries
+  if (searchCache.size >= 32) {
+    searchCache.delete(searchCache.keys().next().value!);
   }
-
+  searchCache.set(cacheKey, { at: Date.now(), data: results });
   return results;
 }
 
 // ============ CONVERSATIONS ============
-export async function fetchConversations(): Promise<Conversation[]> {
+// Short-TTL read cache for the chat sidebar and message history. Write paths
+// invalidate eagerly, so the TTL only bounds staleness from other sessions.
+const READ_CACHE_TTL_MS = 30_000;
+let conversationsCache: { at: number; limit: number; data: Conversation[] } | null = null;
+const messagesCache = new Map<string, { at: number; data: Message[] }>();
+
+// All caches in this module hold per-account reads. Sign-out/sign-in happens
+// in-SPA without a reload, so drop everything whenever the signed-in user
+// changes - one account must never see another's cached data.
+let cachedUserId: string | null = null;
+supabase.auth.onAuthStateChange((_event, session) => {
+  const userId = session?.user?.id ?? null;
+  if (userId !== cachedUserId) {
+    cachedUserId = userId;
+    conversationsCache = null;
+    messagesCache.clear();
+    searchCache.clear();
+  }
+});
+
+export async function fetchConversations(limit = 100): Promise<Conversation[]> {
+  if (
+    conversationsCache &&
+    conversationsCache.limit >= limit &&
+    Date.now() - conversationsCache.at < READ_CACHE_TTL_MS
+  ) {
+    return conversationsCache.limit === limit
+      ? conversationsCache.data
+      : conversationsCache.data.slice(0, limit);
+  }
+
+  // The sidebar only renders the most recent conversations; don't pull the
+  // whole history over the wire
   const { data, error } = await supabase
     .from("conversations")
-    .select("*")
-    .order("updated_at", { ascending: false });
-  
+    .select("id, title, created_at, updated_at")
+    .order("updated_at", { ascending: false })
+    .limit(limit);
+
   if (error) {
     console.error("Error fetching conversations:", error);
     return [];
   }
-  return data || [];
+  conversationsCache = { at: Date.now(), limit, data: data || [] };
+  return conversationsCache.data;
 }
 
 export async function createConversation(title?: string): Promise<Conversation | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -274,6 +343,7 @@ export async function createConversation(title?: string): Promise<Conversation |
     console.error("Error creating conversation:", error);
     return null;
   }
+  conversationsCache = null;
   return data;
 }
 
@@ -283,29 +353,42 @@ export async function deleteConversation(id: string): Promise<boolean> {
     console.error("Error deleting conversation:", error);
     return false;
   }
+  conversationsCache = null;
+  messagesCache.delete(id);
   return true;
 }
 
 // ============ MESSAGES ============
 export async function fetchMessages(conversationId: string): Promise<Message[]> {
+  const cached = messagesCache.get(conversationId);
+  if (cached && Date.now() - cached.at < READ_CACHE_TTL_MS) {
+    return cached.data;
+  }
+
   const { data, error } = await supabase
     .from("messages")
     .select("*")
     .eq("conversation_id", conversationId)
     .order("created_at", { ascending: true });
-  
+
   if (error) {
     console.error("Error fetching messages:", error);
     return [];
   }
-  return (data || []).map(m => ({
-    ...m,
-    role: m.role as "user" | "assistant"
-  }));
+  // Rows already have the right shape; cast the union columns instead of
+  // re-allocating every row just to narrow them
+  const messages = (data || []) as Message[];
+  // Keep the cache bounded; drop the oldest entry past 32 conversations
+  if (messagesCache.size >= 32) {
+    messagesCache.delete(messagesCache.keys().next().value!);
+  }
+  messagesCache.set(conversationId, { at: Date.now(), data: messages });
+  return messages;
 }
 
 export async function saveMessage(conversationId: string, role: "user" | "assistant", content: string): Promise<Message | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -318,14 +401,27 @@ export async function saveMessage(conversationId: string, role: "user" | "assist
     console.error("Error saving message:", error);
     return null;
   }
-  
-  // Update conversation's updated_at
-  await supabase
-    .from("conversations")
-    .update({ updated_at: new Date().toISOString() })
-    .eq("id", conversationId);
-  
-  return data ? { ...data, role: data.role as "user" | "assistant" } : null;
+
+  // conversations.updated_at is bumped by a DB trigger on message insert
+  conversationsCache = null;
+  messagesCache.delete(conversationId);
+  searchCache.clear();
+  return data ? (data as Message) : null;
+}
+
+// Applies the personal/organization visibility filter shared by the CRM,
+// task and project list queries
+function applyContextFilter<T>(query: T, context?: OrgContextFilter): T {
+  if (!context) return query;
+  if (context.mode === "personal") {
+    return (query as any).eq("visibility", "personal");
+  }
+  if (context.mode === "organization" && context.organizationId) {
+    return (query as any)
+      .eq("visibility", "organization")
+      .eq("organization_id", context.organizationId);
+  }
+  return query;
 }
 
 // ============ CONTACTS ============
@@ -335,15 +431,8 @@ export async function fetchContacts(context?: OrgContextFilter): Promise<Contact
     .select("*")
     .order("name", { ascending: true });
   
-  // Filter by context
-  if (context) {
-    if (context.mode === "personal") {
-      query = query.eq("visibility", "personal");
-    } else if (context.mode === "organization" && context.organizationId) {
-      query = query.eq("visibility", "organization").eq("organization_id", context.organizationId);
-    }
-  }
-  
+  query = applyContextFilter(query, context);
+
   const { data, error } = await query;
   
   if (error) {
@@ -354,7 +443,8 @@ export async function fetchContacts(context?: OrgContextFilter): Promise<Contact
 }
 
 export async function createContact(contact: Omit<Contact, "id" | "created_at" | "updated_at">): Promise<Contact | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -373,7 +463,7 @@ export async function createContact(contact: Omit<Contact, "id" | "created_at" |
 export async function updateContact(id: string, contact: Partial<Contact>): Promise<Contact | null> {
   const { data, error } = await supabase
     .from("contacts")
-    .update({ ...contact, updated_at: new Date().toISOString() })
+    .update({ ...contact })
     .eq("id", id)
     .select()
     .single();
@@ -401,15 +491,8 @@ export async function fetchCompanies(context?: OrgContextFilter): Promise<Compan
     .select("*")
     .order("name", { ascending: true });
   
-  // Filter by context
-  if (context) {
-    if (context.mode === "personal") {
-      query = query.eq("visibility", "personal");
-    } else if (context.mode === "organization" && context.organizationId) {
-      query = query.eq("visibility", "organization").eq("organization_id", context.organizationId);
-    }
-  }
-  
+  query = applyContextFilter(query, context);
+
   const { data, error } = await query;
   
   if (error) {
@@ -420,7 +503,8 @@ export async function fetchCompanies(context?: OrgContextFilter): Promise<Compan
 }
 
 export async function createCompany(company: Omit<Company, "id" | "created_at" | "updated_at">): Promise<Company | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -439,7 +523,7 @@ export async function createCompany(company: Omit<Company, "id" | "created_at" |
 export async function updateCompany(id: string, company: Partial<Company>): Promise<Company | null> {
   const { data, error } = await supabase
     .from("companies")
-    .update({ ...company, updated_at: new Date().toISOString() })
+    .update({ ...company })
     .eq("id", id)
     .select()
     .single();
@@ -467,15 +551,8 @@ export async function fetchDeals(context?: OrgContextFilter): Promise<Deal[]> {
     .select("*")
     .order("created_at", { ascending: false });
   
-  // Filter by context
-  if (context) {
-    if (context.mode === "personal") {
-      query = query.eq("visibility", "personal");
-    } else if (context.mode === "organization" && context.organizationId) {
-      query = query.eq("visibility", "organization").eq("organization_id", context.organizationId);
-    }
-  }
-  
+  query = applyContextFilter(query, context);
+
   const { data, error } = await query;
   
   if (error) {
@@ -486,7 +563,8 @@ export async function fetchDeals(context?: OrgContextFilter): Promise<Deal[]> {
 }
 
 export async function createDeal(deal: Omit<Deal, "id" | "created_at" | "updated_at">): Promise<Deal | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -505,7 +583,7 @@ export async function createDeal(deal: Omit<Deal, "id" | "created_at" | "updated
 export async function updateDeal(id: string, deal: Partial<Deal>): Promise<Deal | null> {
   const { data, error } = await supabase
     .from("deals")
-    .update({ ...deal, updated_at: new Date().toISOString() })
+    .update({ ...deal })
     .eq("id", id)
     .select()
     .single();
@@ -533,30 +611,20 @@ export async function fetchTasks(context?: OrgContextFilter): Promise<Task[]> {
     .select("*")
     .order("created_at", { ascending: false });
   
-  // Filter by context
-  if (context) {
-    if (context.mode === "personal") {
-      query = query.eq("visibility", "personal");
-    } else if (context.mode === "organization" && context.organizationId) {
-      query = query.eq("visibility", "organization").eq("organization_id", context.organizationId);
-    }
-  }
-  
+  query = applyContextFilter(query, context);
+
   const { data, error } = await query;
   
   if (error) {
     console.error("Error fetching tasks:", error);
     return [];
   }
-  return (data || []).map(t => ({
-    ...t,
-    priority: t.priority as "low" | "medium" | "high",
-    visibility: t.visibility as "personal" | "organization"
-  }));
+  return (data || []) as Task[];
 }
 
 export async function createTask(task: Omit<Task, "id" | "created_at" | "updated_at" | "category_id">): Promise<Task | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -569,17 +637,13 @@ export async function createTask(task: Omit<Task, "id" | "created_at" | "updated
     console.error("Error creating task:", error);
     return null;
   }
-  return data ? { 
-    ...data, 
-    priority: data.priority as "low" | "medium" | "high",
-    visibility: data.visibility as "personal" | "organization"
-  } : null;
+  return data ? (data as Task) : null;
 }
 
 export async function updateTask(id: string, task: Partial<Task>): Promise<Task | null> {
   const { data, error } = await supabase
     .from("tasks")
-    .update({ ...task, updated_at: new Date().toISOString() })
+    .update({ ...task })
     .eq("id", id)
     .select()
     .single();
@@ -588,7 +652,7 @@ export async function updateTask(id: string, task: Partial<Task>): Promise<Task
     console.error("Error updating task:", error);
     return null;
   }
-  return data ? { ...data, priority: data.priority as "low" | "medium" | "high" } : null;
+  return data ? (data as Task) : null;
 }
 
 export async function deleteTask(id: string): Promise<boolean> {
@@ -607,29 +671,20 @@ export async function fetchProjects(context?: OrgContextFilter): Promise<Project
     .select("*")
     .order("updated_at", { ascending: false });
   
-  // Filter by context
-  if (context) {
-    if (context.mode === "personal") {
-      query = query.eq("visibility", "personal");
-    } else if (context.mode === "organization" && context.organizationId) {
-      query = query.eq("visibility", "organization").eq("organization_id", context.organizationId);
-    }
-  }
-  
+  query = applyContextFilter(query, context);
+
   const { data, error } = await query;
   
   if (error) {
     console.error("Error fetching projects:", error);
     return [];
   }
-  return (data || []).map(p => ({
-    ...p,
-    visibility: p.visibility as "personal" | "organization"
-  }));
+  return (data || []) as Project[];
 }
 
 export async function createProject(project: Omit<Project, "id" | "created_at" | "updated_at" | "drive_folder_id" | "drive_folder_name" | "drive_last_synced_at">): Promise<Project | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -642,13 +697,13 @@ export async function createProject(project: Omit<Project, "id" | "created_at" |
     console.error("Error creating project:", error);
     return null;
   }
-  return data ? { ...data, visibility: data.visibility as "personal" | "organization" } : null;
+  return data ? (data as Project) : null;
 }
 
 export async function updateProject(id: string, project: Partial<Project>): Promise<Project | null> {
   const { data, error } = await supabase
     .from("projects")
-    .update({ ...project, updated_at: new Date().toISOString() })
+    .update({ ...project })
     .eq("id", id)
     .select()
     .single();
@@ -657,7 +712,7 @@ export async function updateProject(id: string, project: Partial<Project>): Prom
     console.error("Error updating project:", error);
     return null;
   }
-  return data ? { ...data, visibility: data.visibility as "personal" | "organization" } : null;
+  return data ? (data as Project) : null;
 }
 
 export async function deleteProject(id: string): Promise<boolean> {
@@ -681,17 +736,15 @@ export async function fetchProjectDocuments(projectId: string): Promise<ProjectD
     console.error("Error fetching project documents:", error);
     return [];
   }
-  return (data || []).map(d => ({
-    ...d,
-    type: d.type as "file" | "document"
-  }));
+  return (data || []) as ProjectDocument[];
 }
 
 export async function createProjectDocument(
   projectId: string, 
   doc: { name: string; type: "file" | "document"; content?: string; file_path?: string; file_size?: number; mime_type?: string }
 ): Promise<ProjectDocument | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
   const { data, error } = await supabase
@@ -713,13 +766,13 @@ export async function createProjectDocument(
     console.error("Error creating project document:", error);
     return null;
   }
-  return data ? { ...data, type: data.type as "file" | "document" } : null;
+  return data ? (data as ProjectDocument) : null;
 }
 
 export async function updateProjectDocument(id: string, doc: Partial<ProjectDocument>): Promise<ProjectDocument | null> {
   const { data, error } = await supabase
     .from("project_documents")
-    .update({ ...doc, updated_at: new Date().toISOString() })
+    .update({ ...doc })
     .eq("id", id)
     .select()
     .single();
@@ -728,7 +781,7 @@ export async function updateProjectDocument(id: string, doc: Partial<ProjectDocu
     console.error("Error updating project document:", error);
     return null;
   }
-  return data ? { ...data, type: data.type as "file" | "document" } : null;
+  return data ? (data as ProjectDocument) : null;
 }
 
 export async function deleteProjectDocument(id: string): Promise<boolean> {
@@ -741,10 +794,15 @@ export async function deleteProjectDocument(id: string): Promise<boolean> {
 }
 
 export async function uploadProjectFile(projectId: string, file: File): Promise<ProjectDocument | null> {
-  const { data: { user } } = await supabase.auth.getUser();
+  const { data: { session } } = await supabase.auth.getSession();
+  const user = session?.user;
   if (!user) return null;
 
-  const filePath = `${user.id}/${projectId}/${Date.now()}_${file.name}`;
+  // Normalize the user-supplied name with plain string work so the storage
+  // key stays a flat path under the user/project prefix (no separators or
+  // traversal sequences from the original filename)
+  const safeName = file.name.replace(/[/\\]+/g, "_").replace(/\.\.+/g, ".");
+  const filePath = `${user.id}/${projectId}/${Date.now()}_${safeName}`;
   
   const { error: uploadError } = await supabase.storage
     .from("project-files")
@@ -788,11 +846,7 @@ export async function fetchProjectTasks(projectId: string): Promise<Task[]> {
     console.error("Error fetching project tasks:", error);
     return [];
   }
-  return (data || []).map(t => ({
-    ...t,
-    priority: t.priority as "low" | "medium" | "high",
-    visibility: t.visibility as "personal" | "organization"
-  }));
+  return (data || []) as Task[];
 }
 
 export async function fetchProjectCalendarEvents(projectId: string): Promise<CalendarEvent[]> {
@@ -810,6 +864,9 @@ export async function fetchProjectCalendarEvents(projectId: string): Promise<Cal
 }
 
 // ============ AI CHAT (Streaming) ============
+// Use fallback URL since env var may not be available in deployed builds
+const CHAT_URL = `${import.meta.env.VITE_SUPABASE_URL || 'https://pccvvqmrwbcdjgkyteqn.supabase.co'}/functions/v1/chat`;
+
 export async function streamChat({
   messages,
   conversationId,
@@ -821,20 +878,13 @@ export async function streamChat({
   onDelta: (deltaText: string) => void;
   onDone: () => void;
 }) {
-  // Use fallback URL since env var may not be available in deployed builds
-  const SUPABASE_URL = import.meta.env.VITE_SUPABASE_URL || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
-  const CHAT_URL = `${SUPABASE_URL}/functions/v1/chat`;
-  console.log("Chat URL:", CHAT_URL);
-  
   const { data: { session } } = await supabase.auth.getSession();
   if (!session) {
     console.error("No session found - user not authenticated");
     throw new Error("Not authenticated");
   }
-  console.log("Session found, user:", session.user.email);
 
   try {
-    console.log("Calling edge function with messages:", messages.length);
     const resp = await fetch(CHAT_URL, {
       method: "POST",
       headers: {
@@ -844,8 +894,6 @@ export async function streamChat({
       body: JSON.stringify({ messages, conversationId }),
     });
 
-    console.log("Response status:", resp.status);
-
     if (!resp.ok) {
       const errorText = await resp.text();
       console.error("Error response:", errorText);
@@ -853,11 +901,8 @@ export async function streamChat({
     }
 
     if (!resp.body) {
-      console.error("No response body");
       throw new Error("No response body");
     }
-    
-    console.log("Got response body, starting stream...");
 
   const reader = resp.body.getReader();
   const decoder = new TextDecoder();
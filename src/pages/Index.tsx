@@ -105,14 +105,18 @@ const Index = () => {
       // Create conversation if needed
       let currentConvId = conversationId;
       if (!currentConvId) {
-        const conv = await createConversation(userInput.slice(0, 50));
+        // The DB titles the conversation from the first user message
+        const conv = await createConversation();
         if (!conv) throw new Error("Failed to create conversation");
         currentConvId = conv.id;
         setConversationId(currentConvId);
       }
 
-      // Save user message
-      await saveMessage(currentConvId, "user", userInput);
+      // Persist the user message in the background; the stream kickoff
+      // shouldn't wait on it
+      const userSave = saveMessage(currentConvId, "user", userInput).catch((e) =>
+        console.error("Failed to save user message:", e)
+      );
 
       // Prepare messages for AI
       const chatMessages = [...messages, userMessage].map(m => ({
@@ -121,20 +125,17 @@ const Index = () => {
       }));
 
       let assistantContent = "";
-      
-      console.log("Starting streamChat with messages:", chatMessages);
+
       await streamChat({
         messages: chatMessages,
         conversationId: currentConvId,
         onDelta: (delta) => {
-          console.log("Received delta:", delta);
           assistantContent += delta;
           setMessages((prev) => {
             const last = prev[prev.length - 1];
             if (last?.role === "assistant") {
-              return prev.map((m, i) => 
-                i === prev.length - 1 ? { ...m, content: assistantContent } : m
-              );
+              // Swap only the tail element; this runs once per streamed token
+              return [...prev.slice(0, -1), { ...last, content: assistantContent }];
             }
             return [...prev, {
               id: crypto.randomUUID(),
@@ -145,12 +146,25 @@ const Index = () => {
           });
         },
         onDone: async () => {
-          console.log("Stream done. Full content:", assistantContent);
-          // Save assistant message
+          // Save assistant message (after the user message has landed, so
+          // created_at ordering stays correct)
           if (currentConvId && assistantContent) {
+            await userSave;
             await saveMessage(currentConvId, "assistant", assistantContent);
           }
-          loadConversations();
+          // The only list change is the active conversation moving to the
+          // top; only a brand-new conversation (titled server-side) needs a
+          // refetch
+          if (conversations.some((c) => c.id === currentConvId)) {
+            setConversations((prev) => {
+              const idx = prev.findIndex((c) => c.id === currentConvId);
+              if (idx < 0) return prev;
+              const bumped = { ...prev[idx], updated_at: new Date().toISOString() };
+              return [bumped, ...prev.slice(0, idx), ...prev.slice(idx + 1)];
+            });
+          } else {
+            loadConversations();
+          }
         },
       });
     } catch (error: any) {
@@ -353,7 +367,8 @@ const Index = () => {
                     if (confirm("Delete this conversation?")) {
                       await deleteConversation(conversationId);
                       startNewConversation();
-                      loadConversations();
+                      // Messages cascade in the DB; prune locally instead of refetching
+                      setConversations((prev) => prev.filter((c) => c.id !== conversationId));
                       toast.success("Conversation deleted");
                     }
                   }} 
@@ -415,7 +430,7 @@ const Index = () => {
                                 if (conversationId === conv.id) {
                                   startNewConversation();
                                 }
-                                loadConversations();
+                                setConversations((prev) => prev.filter((c) => c.id !== conv.id));
                                 toast.success("Conversation deleted");
                               }
                             }}
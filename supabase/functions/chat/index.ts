@@ -6,6 +6,27 @@ const corsHeaders = {
   "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type",
 };
 
+// Precomputed response headers - every response spreads these, so build them once
+const jsonHeaders = { ...corsHeaders, "Content-Type": "application/json" };
+const sseHeaders = { ...corsHeaders, "Content-Type": "text/event-stream" };
+
+// Environment is static per isolate - read it once at cold start instead of per request
+const LOVABLE_API_KEY = Deno.env.get("LOVABLE_API_KEY");
+const SUPABASE_URL = Deno.env.get("SUPABASE_URL") ?? "";
+const SUPABASE_ANON_KEY = Deno.env.get("SUPABASE_ANON_KEY") ?? "";
+const SERVICE_ROLE_KEY = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY");
+
+// Service-role client carries no per-request state, so one instance is reused
+// across requests; only the user-auth client needs to be request-scoped
+let serviceClient: any = null;
+
+// AI gateway endpoint and auth - the headers never change, so build them once
+const AI_GATEWAY_URL = "https://ai.gateway.lovable.dev/v1/chat/completions";
+const AI_GATEWAY_HEADERS = {
+  Authorization: `Bearer ${LOVABLE_API_KEY}`,
+  "Content-Type": "application/json",
+};
+
 // n8n MCP endpoint
 const N8N_MCP_URL = "https://n8n-08HY.sliplane.app/mcp/721deb26-44e7-40e0-87a5-60204e614109";
 
@@ -243,6 +264,10 @@ const tools = [
   }
 ];
 
+// JSON-RPC request ids only need to be unique per connection; a counter is
+// cheaper than minting a UUID per call
+let rpcId = 0;
+
 // Helper function to call n8n MCP workflows
 async function callN8nWorkflow(
   toolName: string,
@@ -259,7 +284,7 @@ async function callN8nWorkflow(
       },
       body: JSON.stringify({
         jsonrpc: "2.0",
-        id: crypto.randomUUID(),
+        id: ++rpcId,
         method: "tools/call",
         params: {
           name: toolName,
@@ -574,6 +599,9 @@ IMPORTANT:
 - For Google Calendar bookings, use RFC3339 with Europe/Stockholm timezone offset (+01:00 in winter, +02:00 in summer).
 - Be direct and actionable. Avoid unnecessary pleasantries.`;
 
+// The system message never varies; build the object once
+const SYSTEM_MESSAGE = { role: "system", content: systemPrompt };
+
 serve(async (req) => {
   if (req.method === "OPTIONS") {
     return new Response(null, { headers: corsHeaders });
@@ -581,15 +609,13 @@ serve(async (req) => {
 
   try {
     const { messages, conversationId } = await req.json();
-    const LOVABLE_API_KEY = Deno.env.get("LOVABLE_API_KEY");
-    
+
     if (!LOVABLE_API_KEY) {
       throw new Error("LOVABLE_API_KEY is not configured");
     }
 
     // Get auth user - support both user JWT and service role with user_id header
     const authHeader = req.headers.get("Authorization");
-    const serviceRoleKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY");
     const userIdHeader = req.headers.get("x-user-id");
     const organizationIdHeader = req.headers.get("x-organization-id");
     
@@ -598,19 +624,22 @@ serve(async (req) => {
     let supabaseClient: any;
     
     // Check if this is a service-to-service call (from slack-webhook etc.)
-    if (authHeader?.includes(serviceRoleKey || "") && userIdHeader) {
+    // Exact match on the whole header - the old substring scan also accepted
+    // headers that merely contained the key, and matched everything when the
+    // key was unset
+    if (SERVICE_ROLE_KEY && authHeader === `Bearer ${SERVICE_ROLE_KEY}` && userIdHeader) {
       // Service role call with explicit user ID
       userId = userIdHeader;
-      supabaseClient = createClient(
-        Deno.env.get("SUPABASE_URL") ?? "",
-        serviceRoleKey ?? "",
+      supabaseClient = serviceClient ??= createClient(
+        SUPABASE_URL,
+        SERVICE_ROLE_KEY ?? "",
       );
       console.log("Service-to-service call for user:", userId, "org:", organizationId);
     } else {
       // Regular user auth
       supabaseClient = createClient(
-        Deno.env.get("SUPABASE_URL") ?? "",
-        Deno.env.get("SUPABASE_ANON_KEY") ?? "",
+        SUPABASE_URL,
+        SUPABASE_ANON_KEY,
         { global: { headers: { Authorization: authHeader ?? "" } } }
       );
 
@@ -619,7 +648,7 @@ serve(async (req) => {
         console.error("Auth error:", authError);
         return new Response(JSON.stringify({ error: "Unauthorized" }), {
           status: 401,
-          headers: { ...corsHeaders, "Content-Type": "application/json" },
+          headers: jsonHeaders,
         });
       }
       userId = user.id;
@@ -627,19 +656,16 @@ serve(async (req) => {
 
     console.log("Chat request from user:", userId, "conversationId:", conversationId);
 
+    // Assemble the gateway message list once; both calls below reuse it
+    const gatewayMessages = [SYSTEM_MESSAGE, ...messages];
+
     // First call - check if AI wants to use tools
-    const initialResponse = await fetch("https://ai.gateway.lovable.dev/v1/chat/completions", {
+    const initialResponse = await fetch(AI_GATEWAY_URL, {
       method: "POST",
-      headers: {
-        Authorization: `Bearer ${LOVABLE_API_KEY}`,
-        "Content-Type": "application/json",
-      },
+      headers: AI_GATEWAY_HEADERS,
       body: JSON.stringify({
         model: "google/gemini-2.5-flash",
-        messages: [
-          { role: "system", content: systemPrompt },
-          ...messages,
-        ],
+        messages: gatewayMessages,
         tools: tools,
         tool_choice: "auto",
       }),
@@ -652,56 +678,54 @@ serve(async (req) => {
       if (initialResponse.status === 429) {
         return new Response(JSON.stringify({ error: "Rate limit exceeded. Please try again later." }), {
           status: 429,
-          headers: { ...corsHeaders, "Content-Type": "application/json" },
+          headers: jsonHeaders,
         });
       }
       if (initialResponse.status === 402) {
         return new Response(JSON.stringify({ error: "AI credits depleted. Please add funds." }), {
           status: 402,
-          headers: { ...corsHeaders, "Content-Type": "application/json" },
+          headers: jsonHeaders,
         });
       }
       
       return new Response(JSON.stringify({ error: "AI service error" }), {
         status: 500,
-        headers: { ...corsHeaders, "Content-Type": "application/json" },
+        headers: jsonHeaders,
       });
     }
 
     const initialData = await initialResponse.json();
     const assistantMessage = initialData.choices?.[0]?.message;
     
-    console.log("Initial response:", JSON.stringify(assistantMessage, null, 2));
+    console.log("Initial response received, tool calls:", assistantMessage?.tool_calls?.length ?? 0);
 
     // Check if there are tool calls
     if (assistantMessage?.tool_calls && assistantMessage.tool_calls.length > 0) {
       console.log("Tool calls detected:", assistantMessage.tool_calls.length);
       
-      // Execute all tool calls
-      const toolResults = [];
-      for (const toolCall of assistantMessage.tool_calls) {
-        const args = JSON.parse(toolCall.function.arguments);
-        const result = await executeTool(toolCall.function.name, args, supabaseClient, userId, organizationId);
-        toolResults.push({
-          tool_call_id: toolCall.id,
-          role: "tool",
-          content: JSON.stringify(result),
-        });
-        console.log(`Tool ${toolCall.function.name} result:`, result);
-      }
+      // Execute all tool calls concurrently - they're independent operations,
+      // and Promise.all keeps results in tool_call order for the follow-up
+      const toolResults = await Promise.all(
+        assistantMessage.tool_calls.map(async (toolCall: any) => {
+          const args = JSON.parse(toolCall.function.arguments);
+          const result = await executeTool(toolCall.function.name, args, supabaseClient, userId, organizationId);
+          console.log(`Tool ${toolCall.function.name} result:`, result);
+          return {
+            tool_call_id: toolCall.id,
+            role: "tool",
+            content: JSON.stringify(result),
+          };
+        })
+      );
 
       // Second call - get AI response with tool results (streaming)
-      const finalResponse = await fetch("https://ai.gateway.lovable.dev/v1/chat/completions", {
+      const finalResponse = await fetch(AI_GATEWAY_URL, {
         method: "POST",
-        headers: {
-          Authorization: `Bearer ${LOVABLE_API_KEY}`,
-          "Content-Type": "application/json",
-        },
+        headers: AI_GATEWAY_HEADERS,
         body: JSON.stringify({
           model: "google/gemini-2.5-flash",
           messages: [
-            { role: "system", content: systemPrompt },
-            ...messages,
+            ...gatewayMessages,
             assistantMessage,
             ...toolResults,
           ],
@@ -717,43 +741,35 @@ serve(async (req) => {
 
       console.log("Streaming final response with tool results");
       return new Response(finalResponse.body, {
-        headers: { ...corsHeaders, "Content-Type": "text/event-stream" },
+        headers: sseHeaders,
       });
     }
 
-    // No tool calls - stream the regular response
-    console.log("No tool calls, streaming regular response");
-    
-    // Re-call with streaming since initial call was non-streaming
-    const streamResponse = await fetch("https://ai.gateway.lovable.dev/v1/chat/completions", {
-      method: "POST",
-      headers: {
-        Authorization: `Bearer ${LOVABLE_API_KEY}`,
-        "Content-Type": "application/json",
+    // No tool calls - the initial call already produced the full completion,
+    // so replay it to the client as SSE instead of paying the gateway for a
+    // second generation of the same answer
+    console.log("No tool calls, replaying initial response as stream");
+
+    const content: string = assistantMessage?.content ?? "";
+    const encoder = new TextEncoder();
+    const replay = new ReadableStream({
+      start(controller) {
+        const chunk = { choices: [{ delta: { content } }] };
+        controller.enqueue(encoder.encode(`data: ${JSON.stringify(chunk)}\n\n`));
+        controller.enqueue(encoder.encode("data: [DONE]\n\n"));
+        controller.close();
       },
-      body: JSON.stringify({
-        model: "google/gemini-2.5-flash",
-        messages: [
-          { role: "system", content: systemPrompt },
-          ...messages,
-        ],
-        stream: true,
-      }),
     });
 
-    if (!streamResponse.ok) {
-      throw new Error("Failed to get streaming response");
-    }
-
-    return new Response(streamResponse.body, {
-      headers: { ...corsHeaders, "Content-Type": "text/event-stream" },
+    return new Response(replay, {
+      headers: sseHeaders,
     });
 
   } catch (error) {
     console.error("Chat function error:", error);
     return new Response(JSON.stringify({ error: error instanceof Error ? error.message : "Unknown error" }), {
       status: 500,
-      headers: { ...corsHeaders, "Content-Type": "application/json" },
+      headers: jsonHeaders,
     });
   }
 });
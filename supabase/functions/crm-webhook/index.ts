@@ -6,6 +6,14 @@ const corsHeaders = {
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type, x-api-key',
 };
 
+const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
+const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? '';
+
+// Admin client is stateless, so one instance is reused, but created lazily
+// behind the key guard so a missing key surfaces as a handled error response
+// instead of an isolate boot failure
+let adminClient: any = null;
+
 serve(async (req) => {
   // Handle CORS preflight
   if (req.method === 'OPTIONS') {
@@ -20,17 +28,13 @@ serve(async (req) => {
   }
 
   try {
-    const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
-    const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    
     if (!supabaseServiceKey) {
       throw new Error('Missing SUPABASE_SERVICE_ROLE_KEY');
     }
-
-    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+    const supabaseAdmin = adminClient ??= createClient(supabaseUrl, supabaseServiceKey);
 
     const body = await req.json();
-    console.log('CRM webhook received:', JSON.stringify(body, null, 2));
+    console.log('CRM webhook received:', body.contact_type || 'contact', body.email ?? '');
 
     // Validate required fields
     const { name, email, phone, company, role, notes, tags, contact_type, user_id, organization_id, visibility, website, industry } = body;
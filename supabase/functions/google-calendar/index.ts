@@ -8,6 +8,10 @@ const corsHeaders = {
 const SUPABASE_URL = Deno.env.get("SUPABASE_URL")!;
 const GOOGLE_CLIENT_ID = Deno.env.get("GOOGLE_CLIENT_ID")!;
 const GOOGLE_CLIENT_SECRET = Deno.env.get("GOOGLE_CLIENT_SECRET")!;
+const SUPABASE_SERVICE_ROLE_KEY = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
+
+// Service-role client, reused across requests
+const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY);
 
 interface TokenData {
   access_token: string;
@@ -18,11 +22,8 @@ interface TokenData {
 
 // Refresh access token if expired
 async function refreshAccessToken(supabase: any, tokenData: TokenData): Promise<string> {
-  const expiresAt = new Date(tokenData.expires_at);
-  const now = new Date();
-  
-  // Add 5 minute buffer
-  if (expiresAt.getTime() - now.getTime() > 5 * 60 * 1000) {
+  // Add 5 minute buffer - numeric epoch compare, no Date objects needed
+  if (Date.parse(tokenData.expires_at) - Date.now() > 5 * 60 * 1000) {
     return tokenData.access_token;
   }
 
@@ -54,7 +55,6 @@ async function refreshAccessToken(supabase: any, tokenData: TokenData): Promise<
     .update({
       access_token: tokens.access_token,
       expires_at: newExpiresAt.toISOString(),
-      updated_at: new Date().toISOString(),
     })
     .eq("user_id", tokenData.user_id);
 
@@ -231,9 +231,6 @@ Deno.serve(async (req) => {
       });
     }
 
-    const supabaseKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
-    const supabase = createClient(SUPABASE_URL, supabaseKey);
-
     const token = authHeader.replace("Bearer ", "");
     const { data: { user }, error: userError } = await supabase.auth.getUser(token);
 
@@ -5,6 +5,12 @@ const corsHeaders = {
   "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type",
 };
 
+const supabaseUrl = Deno.env.get("SUPABASE_URL")!;
+const supabaseKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
+
+// Service-role client, reused across requests
+const supabase = createClient(supabaseUrl, supabaseKey);
+
 interface TokenData {
   access_token: string;
   refresh_token: string;
@@ -45,7 +51,32 @@ async function refreshAccessToken(refreshToken: string): Promise<string | null>
   }
 }
 
+// Access tokens live for an hour; remember them per user so every request
+// doesn't re-read google_auth_tokens. Cache entries are also capped at five
+// minutes so a reconnected account (token row rewritten by google-oauth)
+// can't be shadowed by a stale token for long.
+const EXPIRY_BUFFER_MS = 5 * 60 * 1000;
+const TOKEN_CACHE_TTL_MS = 5 * 60 * 1000;
+const tokenCache = new Map<string, { token: string; expiresAtMs: number; cachedAtMs: number }>();
+
+function cacheToken(userId: string, token: string, expiresAtMs: number) {
+  // Keep the cache bounded; drop the oldest entry past 256 users
+  if (tokenCache.size >= 256) {
+    tokenCache.delete(tokenCache.keys().next().value!);
+  }
+  tokenCache.set(userId, { token, expiresAtMs, cachedAtMs: Date.now() });
+}
+
 async function getValidAccessToken(supabase: any, userId: string): Promise<string | null> {
+  const cached = tokenCache.get(userId);
+  if (
+    cached &&
+    Date.now() - cached.cachedAtMs < TOKEN_CACHE_TTL_MS &&
+    cached.expiresAtMs - Date.now() > EXPIRY_BUFFER_MS
+  ) {
+    return cached.token;
+  }
+
   const { data: tokenData, error } = await supabase
     .from("google_auth_tokens")
     .select("access_token, refresh_token, expires_at")
@@ -57,11 +88,11 @@ async function getValidAccessToken(supabase: any, userId: string): Promise<strin
     return null;
   }
 
-  const now = new Date();
-  const expiresAt = new Date(tokenData.expires_at);
-
-  // If token is still valid (with 5 min buffer), use it
-  if (expiresAt.getTime() - now.getTime() > 5 * 60 * 1000) {
+  // If token is still valid (with 5 min buffer), use it - compare epoch
+  // milliseconds directly instead of building Date objects
+  const expiresAtMs = Date.parse(tokenData.expires_at);
+  if (expiresAtMs - Date.now() > EXPIRY_BUFFER_MS) {
+    cacheToken(userId, tokenData.access_token, expiresAtMs);
     return tokenData.access_token;
   }
 
@@ -77,10 +108,10 @@ async function getValidAccessToken(supabase: any, userId: string): Promise<strin
       .update({
         access_token: newAccessToken,
         expires_at: newExpiresAt.toISOString(),
-        updated_at: new Date().toISOString(),
       })
       .eq("user_id", userId);
 
+    cacheToken(userId, newAccessToken, newExpiresAt.getTime());
     return newAccessToken;
   }
 
@@ -121,7 +152,7 @@ async function listDriveFolders(accessToken: string, parentId?: string, driveId?
   }
 
   // Build URL with shared drive support
-  let url = `https://www.googleapis.com/drive/v3/files?q=${encodeURIComponent(query)}&fields=files(id,name,mimeType)&orderBy=name&supportsAllDrives=true&includeItemsFromAllDrives=true`;
+  let url = `https://www.googleapis.com/drive/v3/files?q=${encodeURIComponent(query)}&fields=files(id,name,mimeType)&orderBy=name&pageSize=1000&supportsAllDrives=true&includeItemsFromAllDrives=true`;
   
   // If accessing a shared drive, add corpora and driveId
   if (driveId) {
@@ -141,7 +172,7 @@ async function listDriveFolders(accessToken: string, parentId?: string, driveId?
   return data.files || [];
 }
 
-async function listDriveFiles(accessToken: string, folderId: string | null, driveId?: string): Promise<any[]> {
+async function listDriveFiles(accessToken: string, folderId: string | null, driveId?: string, mimeType?: string): Promise<any[]> {
   let query: string;
   
   // If we have a driveId but no folderId, we're at the root of a shared drive
@@ -152,8 +183,16 @@ async function listDriveFiles(accessToken: string, folderId: string | null, driv
   } else {
     return [];
   }
+
+  // Let Drive reject non-matching files instead of transferring the whole
+  // listing and filtering client-side
+  if (mimeType) {
+    query += ` and mimeType='${mimeType}'`;
+  }
   
-  let url = `https://www.googleapis.com/drive/v3/files?q=${encodeURIComponent(query)}&fields=files(id,name,mimeType,modifiedTime,size)&orderBy=name&supportsAllDrives=true&includeItemsFromAllDrives=true`;
+  // Max page size - the callers consume the whole folder, and the default of
+  // 100 silently truncates larger folders
+  let url = `https://www.googleapis.com/drive/v3/files?q=${encodeURIComponent(query)}&fields=files(id,name,mimeType,modifiedTime,size)&orderBy=name&pageSize=1000&supportsAllDrives=true&includeItemsFromAllDrives=true`;
 
   // If accessing a shared drive, add corpora and driveId
   if (driveId) {
@@ -220,14 +259,17 @@ async function uploadToDrive(accessToken: string, folderId: string, fileName: st
   const delimiter = `\r\n--${boundary}\r\n`;
   const closeDelimiter = `\r\n--${boundary}--`;
 
-  const body = 
-    delimiter +
-    "Content-Type: application/json; charset=UTF-8\r\n\r\n" +
-    JSON.stringify(metadata) +
-    delimiter +
-    `Content-Type: ${mimeType}\r\n\r\n` +
-    content +
-    closeDelimiter;
+  // Assemble the multipart body from parts rather than concatenating one big
+  // string; fetch consumes the Blob without building another full copy
+  const body = new Blob([
+    delimiter,
+    "Content-Type: application/json; charset=UTF-8\r\n\r\n",
+    JSON.stringify(metadata),
+    delimiter,
+    `Content-Type: ${mimeType}\r\n\r\n`,
+    content,
+    closeDelimiter,
+  ]);
 
   const response = await fetch("https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&fields=id,name,mimeType,modifiedTime", {
     method: "POST",
@@ -307,11 +349,6 @@ Deno.serve(async (req) => {
       });
     }
 
-    // Create Supabase client
-    const supabaseUrl = Deno.env.get("SUPABASE_URL")!;
-    const supabaseKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
-    const supabase = createClient(supabaseUrl, supabaseKey);
-
     // Get user from JWT
     const token = authHeader.replace("Bearer ", "");
     const { data: { user }, error: userError } = await supabase.auth.getUser(token);
@@ -348,7 +385,7 @@ Deno.serve(async (req) => {
         break;
 
       case "list-files":
-        result = await listDriveFiles(accessToken, params.folderId || null, params.driveId);
+        result = await listDriveFiles(accessToken, params.folderId || null, params.driveId, params.mimeType);
         break;
 
       case "download":
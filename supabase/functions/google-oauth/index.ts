@@ -8,6 +8,10 @@ const corsHeaders = {
 const GOOGLE_CLIENT_ID = Deno.env.get("GOOGLE_CLIENT_ID")!;
 const GOOGLE_CLIENT_SECRET = Deno.env.get("GOOGLE_CLIENT_SECRET")!;
 const SUPABASE_URL = Deno.env.get("SUPABASE_URL")!;
+const SUPABASE_SERVICE_ROLE_KEY = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
+
+// Service-role client, reused across requests
+const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY);
 
 // Scopes for Google Drive + Calendar access
 const SCOPES = [
@@ -79,10 +83,6 @@ Deno.serve(async (req) => {
         console.error("Failed to fetch Google user info:", e);
       }
 
-      // Create Supabase client with service role
-      const supabaseKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
-      const supabase = createClient(SUPABASE_URL, supabaseKey);
-
       // Calculate expiry time
       const expiresAt = new Date(Date.now() + tokens.expires_in * 1000);
 
@@ -94,7 +94,6 @@ Deno.serve(async (req) => {
         expires_at: expiresAt.toISOString(),
         google_email: googleEmail,
         scopes: SCOPES.split(" "),
-        updated_at: new Date().toISOString(),
       };
 
       if (organizationId) {
@@ -149,9 +148,6 @@ Deno.serve(async (req) => {
       }
 
       // Verify user
-      const supabaseKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
-      const supabase = createClient(SUPABASE_URL, supabaseKey);
-      
       const token = authHeader.replace("Bearer ", "");
       const { data: { user }, error: userError } = await supabase.auth.getUser(token);
       
@@ -8,16 +8,21 @@ const corsHeaders = {
 
 const SEVENTIME_API_BASE = "https://app.seventime.se/api/2";
 
+const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
+const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+const seventimeApiKey = Deno.env.get('SEVENTIME_API_KEY');
+
+// Admin client is stateless, so one instance is reused, but created lazily
+// behind a key guard so a missing key surfaces as a handled error response
+// instead of an isolate boot failure
+let adminClient: any = null;
+
 serve(async (req) => {
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
   }
 
   try {
-    const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
-    const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    const seventimeApiKey = Deno.env.get('SEVENTIME_API_KEY');
-
     if (!seventimeApiKey) {
       console.error('SEVENTIME_API_KEY not configured');
       return new Response(JSON.stringify({ error: 'SevenTime API key not configured' }), {
@@ -26,7 +31,10 @@ serve(async (req) => {
       });
     }
 
-    const supabaseAdmin = createClient(supabaseUrl, supabaseKey!);
+    if (!supabaseKey) {
+      throw new Error('Missing SUPABASE_SERVICE_ROLE_KEY');
+    }
+    const supabaseAdmin = adminClient ??= createClient(supabaseUrl, supabaseKey);
 
     const { contactId, organizationId } = await req.json();
 
@@ -225,7 +233,6 @@ serve(async (req) => {
       .update({
         seventime_customer_id: seventimeCustomerId,
         seventime_workorder_id: seventimeWorkOrderId,
-        updated_at: new Date().toISOString(),
       })
       .eq('id', contactId);
 
@@ -7,6 +7,17 @@ const corsHeaders = {
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type, x-slack-signature, x-slack-request-timestamp',
 };
 
+const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
+const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? '';
+
+// Admin client for database operations - stateless, so one instance is
+// reused, but created lazily behind the key guard so a missing key surfaces
+// as a handled error response instead of an isolate boot failure
+let adminClient: any = null;
+
+// Strips <@UXXXX> mentions from message text; compiled once, reused per event
+const MENTION_RE = /<@[A-Z0-9]+>/g;
+
 // Verify Slack request signature
 async function verifySlackRequest(
   body: string,
@@ -30,11 +41,23 @@ async function verifySlackRequest(
   return computedSignature === signature;
 }
 
+type SlackSettings = { botToken: string; signingSecret: string; organizationId: string | null };
+
+// Settings change rarely but are needed on every event; cache the resolved
+// value briefly per workspace so probes and retries skip the table scan
+const SETTINGS_CACHE_TTL_MS = 60_000;
+const settingsCache = new Map<string, { at: number; settings: SlackSettings | null }>();
+
 // Get Slack settings from integration_settings by workspace
 async function getSlackSettingsByWorkspace(
-  supabaseClient: any, 
+  supabaseClient: any,
   workspaceId: string
-): Promise<{ botToken: string; signingSecret: string; organizationId: string | null } | null> {
+): Promise<SlackSettings | null> {
+  const cached = settingsCache.get(workspaceId);
+  if (cached && Date.now() - cached.at < SETTINGS_CACHE_TTL_MS) {
+    return cached.settings;
+  }
+
   // Get all Slack settings and find one that matches this workspace
   const { data, error } = await supabaseClient
     .from('integration_settings')
@@ -47,17 +70,20 @@ async function getSlackSettingsByWorkspace(
   }
 
   // Find settings that have bot_token (any configured Slack)
+  let settings: SlackSettings | null = null;
   for (const setting of data) {
     if (setting.settings?.bot_token && setting.settings?.signing_secret) {
-      return {
+      settings = {
         botToken: setting.settings.bot_token,
         signingSecret: setting.settings.signing_secret,
         organizationId: setting.organization_id,
       };
+      break;
     }
   }
-  
-  return null;
+
+  settingsCache.set(workspaceId, { at: Date.now(), settings });
+  return settings;
 }
 
 // Post message to Slack
@@ -159,20 +185,15 @@ serve(async (req) => {
   }
 
   try {
-    const supabaseUrl = Deno.env.get('SUPABASE_URL') || 'https://pccvvqmrwbcdjgkyteqn.supabase.co';
-    const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    
     if (!supabaseServiceKey) {
       throw new Error('Missing SUPABASE_SERVICE_ROLE_KEY');
     }
-
-    // Create admin client for database operations
-    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+    const supabaseAdmin = adminClient ??= createClient(supabaseUrl, supabaseServiceKey);
 
     const bodyText = await req.text();
     const body = JSON.parse(bodyText);
 
-    console.log('Slack webhook received:', JSON.stringify(body, null, 2));
+    console.log('Slack webhook received:', body.type, body.event?.type ?? '');
 
     // Handle Slack URL verification challenge
     if (body.type === 'url_verification') {
@@ -248,7 +269,7 @@ serve(async (req) => {
           });
         }
         const slackUserId = event.user;
-        const messageText = event.text?.replace(/<@[A-Z0-9]+>/g, '').trim() || '';
+        const messageText = event.text?.replace(MENTION_RE, '').trim() || '';
 
         console.log(`Processing NEW message from ${slackUserId}: ${messageText} (ts: ${messageTs})`);
 
@@ -331,47 +352,61 @@ serve(async (req) => {
             });
         }
 
-        // Save user message
-        await supabaseAdmin
+        // Fetch prior history for context; the new message is appended
+        // locally instead of being written and read back
+        const { data: history } = await supabaseAdmin
+          .from('messages')
+          .select('role, content')
+          .eq('conversation_id', conversationId)
+          .order('created_at', { ascending: true })
+          .limit(19);
+
+        const messages = [
+          ...(history || []).map(m => ({
+            role: m.role as string,
+            content: m.content as string,
+          })),
+          { role: 'user', content: messageText },
+        ];
+
+        // Persist the user message while the model generates - the chat call
+        // doesn't read it back. Kept as a named promise so the error path can
+        // still wait for it even when the chat call fails.
+        const userMessageInsert = supabaseAdmin
           .from('messages')
           .insert({
             conversation_id: conversationId,
             user_id: userId,
             role: 'user',
             content: messageText,
+          })
+          .then((res: { error: unknown }) => {
+            if (res.error) console.error('Failed to save user message:', res.error);
           });
 
-        // Fetch conversation history for context
-        const { data: history } = await supabaseAdmin
-          .from('messages')
-          .select('role, content')
-          .eq('conversation_id', conversationId)
-          .order('created_at', { ascending: true })
-          .limit(20);
-
-        const messages = (history || []).map(m => ({
-          role: m.role as string,
-          content: m.content as string,
-        }));
-
         // Call chat function with service role and org context
         try {
-          const aiResponse = await callChatFunction(messages, supabaseServiceKey, supabaseUrl, userId, mappingOrgId);
-
-          // Save AI response
-          await supabaseAdmin
-            .from('messages')
-            .insert({
-              conversation_id: conversationId,
-              user_id: userId,
-              role: 'assistant',
-              content: aiResponse,
-            });
-
-          // Post response to Slack
-          await postSlackMessage(slackSettings.botToken, channelId, aiResponse, threadTs);
+          const [, aiResponse] = await Promise.all([
+            userMessageInsert,
+            callChatFunction(messages, supabaseServiceKey, supabaseUrl, userId, mappingOrgId),
+          ]);
+
+          // Save the AI response and post it to Slack concurrently - neither
+          // depends on the other
+          await Promise.all([
+            supabaseAdmin
+              .from('messages')
+              .insert({
+                conversation_id: conversationId,
+                user_id: userId,
+                role: 'assistant',
+                content: aiResponse,
+              }),
+            postSlackMessage(slackSettings.botToken, channelId, aiResponse, threadTs),
+          ]);
         } catch (chatError) {
           console.error('Chat function error:', chatError);
+          await userMessageInsert;
           await postSlackMessage(
             slackSettings.botToken,
             channelId,
@@ -5,6 +5,14 @@ const corsHeaders = {
   "Access-Control-Allow-Headers": "authorization, x-client-info, apikey, content-type",
 };
 
+const supabaseUrl = Deno.env.get("SUPABASE_URL")!;
+const supabaseServiceKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
+const supabaseAnonKey = Deno.env.get("SUPABASE_ANON_KEY")!;
+
+// Admin client is stateless and reused; the anon client stays request-scoped
+// because it carries the caller's Authorization header
+const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
+
 async function refreshAccessToken(refreshToken: string): Promise<string | null> {
   const clientId = Deno.env.get("GOOGLE_CLIENT_ID");
   const clientSecret = Deno.env.get("GOOGLE_CLIENT_SECRET");
@@ -77,11 +85,9 @@ async function getValidAccessToken(supabase: any, userId: string, organizationId
 }
 
 async function getValidTokenFromData(supabase: any, userId: string, tokenData: any): Promise<string | null> {
-  const now = new Date();
-  const expiresAt = new Date(tokenData.expires_at);
-
-  // If token is still valid (with 5 min buffer), use it
-  if (expiresAt.getTime() - now.getTime() > 5 * 60 * 1000) {
+  // If token is still valid (with 5 min buffer), use it - numeric epoch
+  // compare, no Date objects needed
+  if (Date.parse(tokenData.expires_at) - Date.now() > 5 * 60 * 1000) {
     return tokenData.access_token;
   }
 
@@ -97,7 +103,6 @@ async function getValidTokenFromData(supabase: any, userId: string, tokenData: a
       .update({
         access_token: newAccessToken,
         expires_at: newExpiresAt.toISOString(),
-        updated_at: new Date().toISOString(),
       })
       .eq("user_id", userId);
 
@@ -163,10 +168,6 @@ Deno.serve(async (req) => {
   }
 
   try {
-    const supabaseUrl = Deno.env.get("SUPABASE_URL")!;
-    const supabaseServiceKey = Deno.env.get("SUPABASE_SERVICE_ROLE_KEY")!;
-    const supabaseAnonKey = Deno.env.get("SUPABASE_ANON_KEY")!;
-
     const authHeader = req.headers.get("Authorization");
     if (!authHeader) {
       return new Response(JSON.stringify({ error: "Unauthorized" }), {
@@ -191,7 +192,6 @@ Deno.serve(async (req) => {
     console.log(`Calendar action: ${action || 'sync'}, view: ${viewMode}, range: ${after} to ${before}`);
 
     // Get valid access token
-    const supabaseAdmin = createClient(supabaseUrl, supabaseServiceKey);
     const accessToken = await getValidAccessToken(supabaseAdmin, user.id, organizationId);
     
     if (!accessToken) {
@@ -217,7 +217,9 @@ Deno.serve(async (req) => {
     const googleEvents = await fetchCalendarEvents(accessToken, timeMin, timeMax, calendarId || "primary");
     console.log(`Fetched ${googleEvents.length} events from Google Calendar`);
 
-    // Upsert events to our database
+    // Upsert events to our database; one timestamp for the whole batch
+    // instead of formatting a new one per event
+    const syncedAt = new Date().toISOString();
     let synced = 0;
     for (const event of googleEvents) {
       const startTime = event.start.dateTime || `${event.start.date}T00:00:00Z`;
@@ -235,7 +237,7 @@ Deno.serve(async (req) => {
         is_synced: true,
         organization_id: organizationId || null,
         visibility: organizationId ? "organization" : "personal",
-        updated_at: new Date().toISOString(),
+        updated_at: syncedAt,
       };
 
       // Try to update existing event, or insert new one
@@ -6,6 +6,12 @@ const corsHeaders = {
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 };
 
+const supabaseUrl = Deno.env.get('SUPABASE_URL')!;
+const serviceRoleKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY')!;
+
+// Use service role to access all tasks - client is reused across invocations
+const supabase = createClient(supabaseUrl, serviceRoleKey);
+
 // Notification interval mapping to milliseconds
 const NOTIFICATION_INTERVALS: Record<string, number> = {
   '1h': 60 * 60 * 1000,
@@ -134,13 +140,22 @@ serve(async (req) => {
   console.log('Task notification check started');
 
   try {
-    const supabaseUrl = Deno.env.get('SUPABASE_URL')!;
-    const serviceRoleKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY')!;
-    
-    // Use service role to access all tasks
-    const supabase = createClient(supabaseUrl, serviceRoleKey);
-
     const now = new Date();
+    const nowMs = now.getTime();
+
+    // Slack settings are per-organization and stable within a run; fetch each
+    // org's settings once instead of once per notification. The promise is
+    // cached before it resolves so concurrent tasks for one org share a
+    // single query instead of all missing the cache together.
+    const settingsCache = new Map<string, ReturnType<typeof getSlackSettings>>();
+    const getSettingsCached = (orgId: string) => {
+      let settings = settingsCache.get(orgId);
+      if (!settings) {
+        settings = getSlackSettings(supabase, orgId);
+        settingsCache.set(orgId, settings);
+      }
+      return settings;
+    };
     
     // Get all incomplete tasks with due dates and notification settings
     const { data: tasks, error: tasksError } = await supabase
@@ -158,43 +173,47 @@ serve(async (req) => {
 
     console.log(`Found ${tasks?.length || 0} tasks with notifications enabled`);
 
-    let notificationsSent = 0;
-
-    for (const task of tasks || []) {
+    // Each task's notifications are independent (the atomic claim below
+    // guards against duplicates), so process tasks concurrently
+    const processTask = async (task: any): Promise<number> => {
       const dueDate = new Date(task.due_date);
-      const timeUntilDue = dueDate.getTime() - now.getTime();
-      
+      const dueMs = dueDate.getTime();
+      const timeUntilDue = dueMs - nowMs;
+      let sentForTask = 0;
+
       // Skip if already past due
       if (timeUntilDue < 0) {
-        continue;
+        return 0;
       }
 
       const notificationSettings: string[] = task.notification_settings || [];
       const notificationsSentList: string[] = task.notifications_sent || [];
-      
+      // Membership is checked once per interval; build the set up front
+      const alreadySent = new Set(notificationsSentList);
+
       // Check each notification interval
       for (const interval of notificationSettings) {
         const intervalMs = NOTIFICATION_INTERVALS[interval];
         if (!intervalMs) continue;
-        
+
         // Create unique notification key
         const notificationKey = `${interval}_${task.due_date}`;
-        
+
         // Skip if already sent
-        if (notificationsSentList.includes(notificationKey)) {
+        if (alreadySent.has(notificationKey)) {
           continue;
         }
         
         // Check if we're within the notification window (within 5 minutes of the interval)
-        const notificationTime = dueDate.getTime() - intervalMs;
+        const notificationTime = dueMs - intervalMs;
         const windowStart = notificationTime - 5 * 60 * 1000; // 5 min before
         const windowEnd = notificationTime + 5 * 60 * 1000; // 5 min after
-        
-        if (now.getTime() >= windowStart && now.getTime() <= windowEnd) {
+
+        if (nowMs >= windowStart && nowMs <= windowEnd) {
           console.log(`Sending ${interval} notification for task: ${task.title}`);
           
           // Get Slack settings for the organization
-          const slackSettings = await getSlackSettings(supabase, task.organization_id);
+          const slackSettings = await getSettingsCached(task.organization_id);
           
           if (!slackSettings || !slackSettings.notificationChannel) {
             console.log(`No Slack channel configured for org ${task.organization_id}`);
@@ -214,8 +233,11 @@ serve(async (req) => {
           
           // Mention assigned person if available
           if (task.assigned_to) {
-            const contactName = await getContactName(supabase, task.assigned_to);
-            const slackUserId = await getSlackUserForContact(supabase, task.assigned_to, task.organization_id);
+            // Independent lookups - issue them in one round of queries
+            const [contactName, slackUserId] = await Promise.all([
+              getContactName(supabase, task.assigned_to),
+              getSlackUserForContact(supabase, task.assigned_to, task.organization_id),
+            ]);
             
             if (slackUserId) {
               message += `\n\n👤 <@${slackUserId}>`;
@@ -253,7 +275,7 @@ serve(async (req) => {
           );
           
           if (sent) {
-            notificationsSent++;
+            sentForTask++;
             console.log(`Notification sent for task ${task.id}`);
           } else {
             // Rollback if send failed
@@ -264,6 +286,19 @@ serve(async (req) => {
           }
         }
       }
+
+      return sentForTask;
+    };
+
+    // Process a few tasks at a time - an org's notifications all post to the
+    // same Slack channel, which rate-limits around one message per second,
+    // and a rejected send whose retry misses the +-5 min window is dropped
+    const BATCH_SIZE = 5;
+    const allTasks = tasks || [];
+    let notificationsSent = 0;
+    for (let i = 0; i < allTasks.length; i += BATCH_SIZE) {
+      const counts = await Promise.all(allTasks.slice(i, i + BATCH_SIZE).map(processTask));
+      notificationsSent += counts.reduce((sum, n) => sum + n, 0);
     }
 
     console.log(`Task notification check complete. Sent ${notificationsSent} notifications.`);
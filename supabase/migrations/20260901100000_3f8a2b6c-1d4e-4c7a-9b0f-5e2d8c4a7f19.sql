@@ -0,0 +1,19 @@
+-- Bump the parent conversation's updated_at whenever a message is inserted,
+-- so clients don't need a second UPDATE round-trip after saving a message
+CREATE OR REPLACE FUNCTION public.touch_conversation_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE public.conversations
+  SET updated_at = now()
+  WHERE id = NEW.conversation_id;
+  RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER touch_conversation_on_message_insert
+AFTER INSERT ON public.messages
+FOR EACH ROW EXECUTE FUNCTION public.touch_conversation_updated_at();
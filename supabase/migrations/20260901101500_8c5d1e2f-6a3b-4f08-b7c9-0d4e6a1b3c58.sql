@@ -0,0 +1,8 @@
+-- Composite indexes for the two hottest list queries:
+-- messages are always fetched by conversation ordered by created_at,
+-- and the sidebar lists a user's conversations newest-first
+CREATE INDEX idx_messages_conversation_id_created_at
+  ON public.messages (conversation_id, created_at);
+
+CREATE INDEX idx_conversations_user_id_updated_at
+  ON public.conversations (user_id, updated_at DESC);
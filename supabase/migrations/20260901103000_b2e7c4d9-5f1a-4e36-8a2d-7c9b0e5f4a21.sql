@@ -0,0 +1,20 @@
+-- Title a fresh conversation from its first user message server-side
+-- (left(content, 50)) instead of having clients pre-truncate and send a title
+CREATE OR REPLACE FUNCTION public.touch_conversation_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  UPDATE public.conversations
+  SET updated_at = now(),
+      title = CASE
+        WHEN (title IS NULL OR title = 'New Chat') AND NEW.role = 'user'
+          THEN left(NEW.content, 50)
+        ELSE title
+      END
+  WHERE id = NEW.conversation_id;
+  RETURN NEW;
+END;
+$$;
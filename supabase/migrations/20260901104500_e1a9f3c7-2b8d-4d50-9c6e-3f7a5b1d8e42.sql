@@ -0,0 +1,4 @@
+-- Refresh planner statistics after adding the chat list indexes so the new
+-- composite indexes are picked up immediately instead of after autovacuum
+ANALYZE public.messages;
+ANALYZE public.conversations;
@@ -0,0 +1,7 @@
+-- notes and tasks were missing the shared updated_at trigger the other tables
+-- use, which forced clients to compute and send updated_at on every update
+DROP TRIGGER IF EXISTS update_notes_updated_at ON public.notes;
+CREATE TRIGGER update_notes_updated_at BEFORE UPDATE ON public.notes FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_tasks_updated_at ON public.tasks;
+CREATE TRIGGER update_tasks_updated_at BEFORE UPDATE ON public.tasks FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
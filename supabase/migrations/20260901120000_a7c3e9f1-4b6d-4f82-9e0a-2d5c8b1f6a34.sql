@@ -0,0 +1,6 @@
+-- Substring search (ilike '%query%') over notes and messages can only seq-scan
+-- without trigram support; GIN trigram indexes keep those queries on an index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX idx_notes_content_trgm ON public.notes USING gin (content gin_trgm_ops);
+CREATE INDEX idx_messages_content_trgm ON public.messages USING gin (content gin_trgm_ops);
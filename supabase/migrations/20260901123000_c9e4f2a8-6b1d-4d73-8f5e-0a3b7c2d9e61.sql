@@ -0,0 +1,26 @@
+-- Time-ordered UUIDs (v7) for messages: random v4 ids scatter inserts across
+-- the primary-key btree, while v7 ids cluster new rows in a warm page range.
+-- Messages are the highest-ingest table, so it benefits most.
+CREATE OR REPLACE FUNCTION public.uuid_v7()
+RETURNS uuid
+LANGUAGE sql
+VOLATILE
+SET search_path = public
+AS $$
+  SELECT encode(
+    set_bit(
+      set_bit(
+        overlay(
+          uuid_send(gen_random_uuid())
+          placing substring(int8send((extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+          FROM 1 FOR 6
+        ),
+        52, 1
+      ),
+      53, 1
+    ),
+    'hex'
+  )::uuid;
+$$;
+
+ALTER TABLE public.messages ALTER COLUMN id SET DEFAULT public.uuid_v7();
@@ -0,0 +1,15 @@
+-- Rank note search hits by trigram similarity instead of leaving scoring to a
+-- fixed placeholder in the client. The ILIKE predicate keeps the query on the
+-- trigram index; similarity() is only computed for matching rows.
+CREATE OR REPLACE FUNCTION public.search_notes_ranked(p_query text, p_limit integer DEFAULT 20)
+RETURNS TABLE (id uuid, content text, score real)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT n.id, n.content, similarity(n.content, p_query) AS score
+  FROM public.notes n
+  WHERE n.content ILIKE '%' || p_query || '%'
+  ORDER BY 3 DESC
+  LIMIT p_limit;
+$$;
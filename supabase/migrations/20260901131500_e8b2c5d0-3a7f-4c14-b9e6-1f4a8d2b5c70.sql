@@ -0,0 +1,14 @@
+-- Same ranked treatment for conversation search: trigram similarity over the
+-- messages index, replacing the client's fixed placeholder score
+CREATE OR REPLACE FUNCTION public.search_messages_ranked(p_query text, p_limit integer DEFAULT 10)
+RETURNS TABLE (conversation_id uuid, content text, score real)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT m.conversation_id, m.content, similarity(m.content, p_query) AS score
+  FROM public.messages m
+  WHERE m.content ILIKE '%' || p_query || '%'
+  ORDER BY 3 DESC
+  LIMIT p_limit;
+$$;
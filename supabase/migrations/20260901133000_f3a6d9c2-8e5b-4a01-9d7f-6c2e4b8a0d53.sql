@@ -0,0 +1,5 @@
+-- Refresh statistics for the search-heavy tables now that the trigram indexes
+-- and ranked search functions are in place, so the planner's selectivity
+-- estimates for ILIKE predicates are based on current data
+ANALYZE public.notes;
+ANALYZE public.messages;
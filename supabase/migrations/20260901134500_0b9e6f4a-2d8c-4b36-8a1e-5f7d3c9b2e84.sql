@@ -0,0 +1,24 @@
+-- Combined memory search: one round-trip that merges ranked note and
+-- conversation hits server-side instead of two sequential client queries
+CREATE OR REPLACE FUNCTION public.search_memory(p_query text, p_limit integer DEFAULT 20)
+RETURNS TABLE (id uuid, content text, score real, result_type text)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT * FROM (
+    (SELECT n.id, n.content, similarity(n.content, p_query) AS score, 'note'::text AS result_type
+     FROM public.notes n
+     WHERE n.content ILIKE '%' || p_query || '%'
+     ORDER BY 3 DESC
+     LIMIT p_limit)
+    UNION ALL
+    (SELECT m.conversation_id, m.content, similarity(m.content, p_query) AS score, 'conversation'::text
+     FROM public.messages m
+     WHERE m.content ILIKE '%' || p_query || '%'
+     ORDER BY 3 DESC
+     LIMIT p_limit)
+  ) hits
+  ORDER BY hits.score DESC
+  LIMIT p_limit;
+$$;
@@ -0,0 +1,29 @@
+-- Optional source filter for combined memory search, applied inside the query
+-- so a filtered search skips the other branch entirely instead of fetching
+-- and discarding rows
+DROP FUNCTION public.search_memory(text, integer);
+
+CREATE FUNCTION public.search_memory(p_query text, p_limit integer DEFAULT 20, p_type text DEFAULT NULL)
+RETURNS TABLE (id uuid, content text, score real, result_type text)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT * FROM (
+    (SELECT n.id, n.content, similarity(n.content, p_query) AS score, 'note'::text AS result_type
+     FROM public.notes n
+     WHERE (p_type IS NULL OR p_type = 'note')
+       AND n.content ILIKE '%' || p_query || '%'
+     ORDER BY 3 DESC
+     LIMIT p_limit)
+    UNION ALL
+    (SELECT m.conversation_id, m.content, similarity(m.content, p_query) AS score, 'conversation'::text
+     FROM public.messages m
+     WHERE (p_type IS NULL OR p_type = 'conversation')
+       AND m.content ILIKE '%' || p_query || '%'
+     ORDER BY 3 DESC
+     LIMIT p_limit)
+  ) hits
+  ORDER BY hits.score DESC
+  LIMIT p_limit;
+$$;
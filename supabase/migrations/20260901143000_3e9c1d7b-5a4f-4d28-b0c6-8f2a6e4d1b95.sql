@@ -0,0 +1,5 @@
+-- google_auth_tokens was missing the shared updated_at trigger, so the token
+-- refresh paths in three edge functions each computed and sent updated_at
+-- themselves; maintain it server-side like the other tables
+DROP TRIGGER IF EXISTS update_google_auth_tokens_updated_at ON public.google_auth_tokens;
+CREATE TRIGGER update_google_auth_tokens_updated_at BEFORE UPDATE ON public.google_auth_tokens FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
@@ -0,0 +1,4 @@
+-- calendar_events also predates the shared updated_at trigger; without it the
+-- sync upsert would leave updated_at stale now that clients no longer send it
+DROP TRIGGER IF EXISTS update_calendar_events_updated_at ON public.calendar_events;
+CREATE TRIGGER update_calendar_events_updated_at BEFORE UPDATE ON public.calendar_events FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
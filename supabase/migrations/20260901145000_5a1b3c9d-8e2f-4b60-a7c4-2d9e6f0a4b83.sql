@@ -0,0 +1,34 @@
+-- The search panel renders 200-character previews, but search_memory shipped
+-- full note and message bodies over the wire. Project the preview in SQL;
+-- ranking still runs over the full text.
+CREATE OR REPLACE FUNCTION public.search_memory(p_query text, p_limit integer DEFAULT 20, p_type text DEFAULT NULL)
+RETURNS TABLE (id uuid, content text, score real, result_type text)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT * FROM (
+    (SELECT n.id, left(n.content, 200) AS content, similarity(n.content, p_query) AS score, 'note'::text AS result_type
+     FROM public.notes n
+     WHERE (p_type IS NULL OR p_type = 'note')
+       AND n.content ILIKE '%' || p_query || '%'
+     ORDER BY 3 DESC
+     LIMIT p_limit)
+    UNION ALL
+    (SELECT conv.* FROM (
+       SELECT DISTINCT ON (m.conversation_id)
+         m.conversation_id AS id,
+         left(m.content, 200) AS content,
+         similarity(m.content, p_query) AS score,
+         'conversation'::text AS result_type
+       FROM public.messages m
+       WHERE (p_type IS NULL OR p_type = 'conversation')
+         AND m.content ILIKE '%' || p_query || '%'
+       ORDER BY m.conversation_id, 3 DESC
+     ) conv
+     ORDER BY conv.score DESC
+     LIMIT p_limit)
+  ) hits
+  ORDER BY hits.score DESC
+  LIMIT p_limit;
+$$;